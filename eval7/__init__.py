@@ -5,7 +5,8 @@
 
 from __future__ import absolute_import
 
-from .evaluate import evaluate, handtype
+from .evaluate import evaluate, handtype, range_composition
 from .cards import Card, Deck, ranks, suits
 from .equity import py_hand_vs_range_monte_carlo, py_hand_vs_range_exact, py_all_hands_vs_range
 from .handrange import HandRange
+from .simulate import simulate
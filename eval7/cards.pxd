@@ -5,7 +5,11 @@
 
 import cython
 
+from .xorshift_rand cimport xorshift_state
+
 cdef class Card:
     cdef public unsigned long long mask
 
 cdef unsigned long long cards_to_mask(py_cards)
+cdef unsigned long long deal_card(xorshift_state *state,
+        unsigned long long dead)
@@ -6,6 +6,8 @@
 import cython
 import random
 
+from .xorshift_rand cimport randint_state
+
 
 ranks = ('2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A')
 suits = ('c', 'd', 'h', 's')
@@ -126,6 +128,29 @@ cdef unsigned long long cards_to_mask(py_cards):
         cards |= py_card.mask
     return cards
 
+cdef unsigned long long card_masks_table[52]
+
+
+cdef unsigned int load_card_masks():
+    for i in range(52):
+        card_masks_table[i] = (<unsigned long long>1) << i
+    return 0
+
+
+load_card_masks()
+
+
+cdef unsigned long long deal_card(xorshift_state *state,
+        unsigned long long dead):
+    """Return the mask of a random card not in dead, drawn from state."""
+    cdef unsigned int cardex
+    cdef unsigned long long card
+    while True:
+        cardex = randint_state(state, 52)
+        card = card_masks_table[cardex]
+        if dead & card == 0:
+            return card
+
 cdef int find_set_bit(unsigned long long value):
     """Finds the bit set in value assuming value has exactly one bit set."""
     cdef int r = 0
@@ -3,9 +3,9 @@
 # This software may be modified and distributed under the terms
 # of the MIT license.  See the LICENSE file for details.
 
-from .xorshift_rand cimport randint
+from .xorshift_rand cimport shared_state
 from .evaluate cimport cy_evaluate
-from .cards cimport cards_to_mask
+from .cards cimport cards_to_mask, deal_card
 
 
 cdef extern from "stdlib.h":
@@ -14,18 +14,6 @@ cdef extern from "stdlib.h":
     void free(void *ptr)
 
 
-cdef unsigned long long card_masks_table[52]
-
-
-cdef unsigned int load_card_masks():
-    for i in range(52):
-        card_masks_table[i] = 1 << i
-    return 0
-
-
-load_card_masks()
-
-
 cdef unsigned int filter_options(unsigned long long *source, 
         unsigned long long *target, 
         unsigned int num_options, 
@@ -44,16 +32,6 @@ cdef unsigned int filter_options(unsigned long long *source,
     return total
 
 
-cdef unsigned long long deal_card(unsigned long long dead):
-    cdef unsigned int cardex
-    cdef unsigned long long card
-    while True:
-        cardex = randint(52)
-        card = card_masks_table[cardex]
-        if dead & card == 0:
-            return card
-
-
 cdef float hand_vs_range_monte_carlo(unsigned long long hand, 
         unsigned long long *options, 
         int num_options, 
@@ -86,7 +64,7 @@ cdef float hand_vs_range_monte_carlo(unsigned long long hand,
         dealt = hand | option
         board = start_board
         for j in range(5 - num_board):
-            board |= deal_card(board | dealt)
+            board |= deal_card(shared_state(), board | dealt)
         hero = cy_evaluate(board | hand, 7)
         villain = cy_evaluate(board | option, 7)
         if hero > villain:
@@ -173,3 +173,89 @@ cpdef handtype(unsigned int value):
         return "Quads"
     else:
         return "Straight Flush"
+
+
+cdef unsigned int DRAW_FLUSH = 1
+cdef unsigned int DRAW_STRAIGHT = 2
+
+
+cdef unsigned int cy_draws(unsigned long long hand, unsigned long long board,
+        unsigned int code):
+    """
+    Return DRAW_* flags for the draws hand makes on an incomplete board.
+
+    Only draws which use a hole card and improve on the made hand code are
+    counted.
+    """
+    cdef unsigned long long cards = hand | board
+    cdef unsigned int draws = 0
+    cdef unsigned int ranks = 0, board_ranks = 0, suited, bit
+    cdef int suit, offset, r
+    for suit in range(4):
+        offset = suit * DIAMOND_OFFSET
+        suited = <unsigned int>((cards >> offset) & 0x1fffUL)
+        ranks |= suited
+        board_ranks |= <unsigned int>((board >> offset) & 0x1fffUL)
+        if (code < HANDTYPE_VALUE_FLUSH >> HANDTYPE_SHIFT
+                and N_BITS_TABLE[suited] == 4
+                and (hand >> offset) & 0x1fffUL != 0):
+            draws |= DRAW_FLUSH
+    if code < HANDTYPE_VALUE_STRAIGHT >> HANDTYPE_SHIFT:
+        for r in range(13):
+            bit = 1U << r
+            if (ranks & bit == 0 and STRAIGHT_TABLE[ranks | bit]
+                    > STRAIGHT_TABLE[board_ranks | bit]):
+                draws |= DRAW_STRAIGHT
+                break
+    return draws
+
+
+def range_composition(py_range, py_board):
+    """
+    range_composition(hand_range, board) -> (counts, values)
+
+    Break a range down by the hands it makes on a board. 'hand_range' is a
+    HandRange (or sequence of (hand, weight) pairs) and 'board' a sequence of
+    eval7.Card objects. Hands sharing a card with the board are dropped.
+
+    'counts' maps each handtype name, plus 'Flush Draw' and 'Straight Draw',
+    to the total weight of hands in that category. Draws are only counted on
+    boards with fewer than five cards. 'values' maps each live hand to its
+    evaluate(hand + board) value, so the handtype code is value >> 24 and the
+    kickers are in the low bits. A hand listed more than once in the range
+    contributes each of its weights to 'counts' but appears once in 'values'.
+    """
+    cdef unsigned long long board = cards_to_mask(py_board)
+    cdef unsigned int num_board = len(py_board)
+    cdef unsigned long long hand
+    cdef unsigned int value, code, draws
+    cdef double weight
+    cdef double totals[9]
+    cdef double flush_draws = 0, straight_draws = 0
+    cdef int i
+    for i in range(9):
+        totals[i] = 0
+
+    values = {}
+    for py_hand, py_weight in py_range:
+        hand = cards_to_mask(py_hand)
+        if hand & board:
+            continue
+        weight = py_weight
+        value = cy_evaluate(hand | board, num_board + len(py_hand))
+        code = value >> HANDTYPE_SHIFT
+        totals[code] += weight
+        values[py_hand] = value
+        if num_board < 5:
+            draws = cy_draws(hand, board, code)
+            if draws & DRAW_FLUSH:
+                flush_draws += weight
+            if draws & DRAW_STRAIGHT:
+                straight_draws += weight
+
+    counts = {}
+    for i in range(9):
+        counts[handtype(i << HANDTYPE_SHIFT)] = totals[i]
+    counts['Flush Draw'] = flush_draws
+    counts['Straight Draw'] = straight_draws
+    return counts, values
@@ -0,0 +1,227 @@
+# Copyright 2014 Anonymous7 from Reddit, Julian Andrews
+#
+# This software may be modified and distributed under the terms
+# of the MIT license.  See the LICENSE file for details.
+
+from cpython cimport array
+import array
+
+from .xorshift_rand cimport (xorshift_state, shared_state, seed_state,
+        next_rand, randint_state, random_state)
+from .evaluate cimport cy_evaluate
+from .cards cimport cards_to_mask, deal_card
+from .xorshift_rand import MAX_ULONG
+
+
+cdef extern from "stdlib.h":
+    ctypedef unsigned long size_t
+    void *malloc(size_t n_bytes)
+    void free(void *ptr)
+
+
+MAX_PLAYERS = 23
+MAX_ATTEMPTS = 100000
+
+cdef array.array MASK_TEMPLATE = array.array('Q')
+cdef array.array VALUE_TEMPLATE = array.array('I')
+
+
+cdef int deal_ranges(xorshift_state *state,
+        unsigned int num_players,
+        unsigned long long *options,
+        double *weights,
+        unsigned int *starts,
+        unsigned int *counts,
+        unsigned long long *hands):
+    """
+    Deal a hand to every player with a range, sampled by weight.
+
+    Players with an empty range (counts[p] == 0) are given a zero mask. If the
+    sampled hands collide the whole deal is redrawn, so the result is an
+    unbiased sample of the joint distribution. Returns 0 on success, or -1 if
+    no compatible deal was found after MAX_ATTEMPTS tries.
+    """
+    cdef unsigned long long dead
+    cdef unsigned int index, attempt, p
+    cdef int collision
+    for 0 <= attempt < MAX_ATTEMPTS:
+        dead = 0
+        collision = 0
+        for 0 <= p < num_players:
+            hands[p] = 0
+            if counts[p] == 0:
+                continue
+            while True:
+                index = starts[p] + randint_state(state, counts[p])
+                if random_state(state) <= weights[index]:
+                    break
+            if options[index] & dead:
+                collision = 1
+                break
+            hands[p] = options[index]
+            dead |= options[index]
+        if not collision:
+            return 0
+    return -1
+
+
+cdef int fill_chunk(xorshift_state *state,
+        unsigned int num_players,
+        unsigned int num_deals,
+        unsigned long long *options,
+        double *weights,
+        unsigned int *starts,
+        unsigned int *counts,
+        unsigned long long *hands,
+        unsigned long long *boards,
+        unsigned int *values,
+        unsigned int *winners):
+    """
+    Deal and evaluate num_deals complete deals into preallocated buffers.
+
+    hands and values hold num_players entries per deal, boards and winners
+    one entry per deal. Returns 0 on success, or -1 if the ranges could not
+    be dealt.
+    """
+    cdef unsigned long long dead
+    cdef unsigned long long board
+    cdef unsigned long long *hand
+    cdef unsigned int *value
+    cdef unsigned int best
+    cdef unsigned int winner_mask
+    cdef unsigned int i, p, j
+    for 0 <= i < num_deals:
+        hand = hands + i * num_players
+        value = values + i * num_players
+        if deal_ranges(state, num_players, options, weights, starts, counts,
+                hand):
+            return -1
+        dead = 0
+        for 0 <= p < num_players:
+            dead |= hand[p]
+        for 0 <= p < num_players:
+            if hand[p] == 0:
+                hand[p] = deal_card(state, dead)
+                hand[p] |= deal_card(state, dead | hand[p])
+                dead |= hand[p]
+        board = 0
+        for 0 <= j < 5:
+            board |= deal_card(state, dead | board)
+        boards[i] = board
+        best = 0
+        winner_mask = 0
+        for 0 <= p < num_players:
+            value[p] = cy_evaluate(board | hand[p], 7)
+            if value[p] > best:
+                best = value[p]
+                winner_mask = 1U << p
+            elif value[p] == best:
+                winner_mask |= 1U << p
+        winners[i] = winner_mask
+    return 0
+
+
+def simulate(num_players, num_deals=None, chunk_size=65536, ranges=None,
+        seed=None):
+    """
+    simulate(num_players, num_deals=None, chunk_size=65536, ranges=None,
+             seed=None) -> iterator of (hands, boards, values, winners)
+
+    Generate random complete deals for num_players players, chunk_size deals
+    at a time. If num_deals is None deals are generated indefinitely,
+    otherwise the last chunk may be short.
+
+    Each chunk is a tuple of array.array buffers, which can be wrapped without
+    copying using numpy.asarray:
+        hands   - 'Q' card masks, num_players per deal
+        boards  - 'Q' card masks of the five card board, one per deal
+        values  - 'I' evaluator values, num_players per deal
+        winners - 'I' bitmask of the players sharing the pot, one per deal
+
+    ranges, if given, is a sequence of num_players HandRange objects (or None
+    for a random hand) restricting each player's hole cards. Hands are
+    sampled in proportion to their weights.
+
+    Each generator has its own xorshift state, so the output for a given seed
+    is reproducible regardless of other random calls. Without a seed the
+    state is seeded from eval7's shared random number generator.
+    """
+    if not 1 <= num_players <= MAX_PLAYERS:
+        raise ValueError(
+            "num_players must be between 1 and {}".format(MAX_PLAYERS))
+    if num_deals is not None and num_deals < 0:
+        raise ValueError("num_deals must not be negative")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if ranges is None:
+        ranges = [None] * num_players
+    if len(ranges) != num_players:
+        raise ValueError("Expected one range per player")
+    for p, hand_range in enumerate(ranges):
+        if hand_range is not None and not any(w > 0 for _, w in hand_range):
+            raise ValueError("Empty range for player {}".format(p))
+    return _simulate(num_players, num_deals, chunk_size, ranges, seed)
+
+
+def _simulate(num_players, num_deals, chunk_size, ranges, seed):
+    """Generator backing simulate. Arguments are assumed to be validated."""
+    cdef unsigned int c_num_players = num_players
+    cdef unsigned int num_options = sum(len(r) for r in ranges if r is not None)
+    cdef unsigned long long *options = <unsigned long long *>malloc(
+            sizeof(unsigned long long) * max(num_options, 1))
+    cdef double *weights = <double *>malloc(
+            sizeof(double) * max(num_options, 1))
+    cdef unsigned int *starts = <unsigned int *>malloc(
+            sizeof(unsigned int) * num_players)
+    cdef unsigned int *counts = <unsigned int *>malloc(
+            sizeof(unsigned int) * num_players)
+    cdef xorshift_state *state = <xorshift_state *>malloc(
+            sizeof(xorshift_state))
+    cdef unsigned int index = 0
+    cdef unsigned int start
+    cdef unsigned int size
+    cdef array.array hands, boards, values, winners
+
+    try:
+        for p, hand_range in enumerate(ranges):
+            starts[p] = index
+            start = index
+            if hand_range is not None:
+                for hand, weight in hand_range:
+                    if weight > 0:
+                        options[index] = cards_to_mask(hand)
+                        weights[index] = weight
+                        index += 1
+                max_weight = 0
+                for i in range(start, index):
+                    max_weight = max(max_weight, weights[i])
+                for i in range(start, index):
+                    weights[i] /= max_weight
+            counts[p] = index - start
+
+        if seed is None:
+            seed_state(state, next_rand(shared_state()))
+        else:
+            seed_state(state, seed % MAX_ULONG)
+
+        remaining = num_deals
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            hands = array.clone(MASK_TEMPLATE, size * num_players, False)
+            boards = array.clone(MASK_TEMPLATE, size, False)
+            values = array.clone(VALUE_TEMPLATE, size * num_players, False)
+            winners = array.clone(VALUE_TEMPLATE, size, False)
+            if fill_chunk(state, c_num_players, size, options, weights, starts,
+                    counts, hands.data.as_ulonglongs,
+                    boards.data.as_ulonglongs, values.data.as_uints,
+                    winners.data.as_uints):
+                raise ValueError("Unable to deal compatible hands from ranges")
+            if remaining is not None:
+                remaining -= size
+            yield hands, boards, values, winners
+    finally:
+        free(options)
+        free(weights)
+        free(starts)
+        free(counts)
+        free(state)
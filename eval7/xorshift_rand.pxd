@@ -5,6 +5,16 @@
 
 import cython
 
+ctypedef struct xorshift_state:
+    unsigned long seed[16]
+    int seed_index
+
+cdef xorshift_state *shared_state()
+cdef void seed_state(xorshift_state *state, unsigned long seed)
+cdef unsigned long next_rand(xorshift_state *state)
+cdef int randint_state(xorshift_state *state, int n)
+cdef double random_state(xorshift_state *state)
+
 cdef void cy_seed(unsigned long seed)
 cpdef int randint(int n)
 cpdef double random()
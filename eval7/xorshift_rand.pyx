@@ -10,39 +10,41 @@ import cython
 
 __all__ = ["seed", "randint"]
 
-cdef unsigned long _seed[16]
-cdef int _seed_index;
+cdef xorshift_state _state
 
-cdef void cy_seed(unsigned long seed):
+cdef xorshift_state *shared_state():
+    """Return the state used by the module level functions."""
+    return &_state
+
+cdef void seed_state(xorshift_state *state, unsigned long seed):
     """Use xorshift64* with a 64 bit seed to generate a 1024 bit seed.
 
     Obviously this limits the number of possible seeds, but should be
     good enough for most practical purposes."""
-    global _seed, _seed_index
-    _seed[0] = seed
-    _seed_index = 0
+    cdef int i
+    state.seed[0] = seed
+    state.seed_index = 0
     for i in range(15):
-        _seed[i + 1] = _seed[i] ^ (_seed[i] >> 12)
-        _seed[i + 1] = _seed[i + 1] ^ (_seed[i + 1] << 25)
-        _seed[i + 1] = _seed[i + 1] ^ (_seed[i + 1] >> 27)
-        _seed[i + 1] = _seed[i + 1] * <unsigned long> (2685821657736338717)
+        state.seed[i + 1] = state.seed[i] ^ (state.seed[i] >> 12)
+        state.seed[i + 1] = state.seed[i + 1] ^ (state.seed[i + 1] << 25)
+        state.seed[i + 1] = state.seed[i + 1] ^ (state.seed[i + 1] >> 27)
+        state.seed[i + 1] = state.seed[i + 1] * <unsigned long> (2685821657736338717)
 
-cdef unsigned long next_rand():
+cdef unsigned long next_rand(xorshift_state *state):
     """Return a random ulong using xorshift1024*."""
-    global _seed, _seed_index
     cdef unsigned long s0, s1
 
-    s0 = _seed[_seed_index];
-    _seed_index = (_seed_index + 1) & 15
-    s1 = _seed[_seed_index];
+    s0 = state.seed[state.seed_index];
+    state.seed_index = (state.seed_index + 1) & 15
+    s1 = state.seed[state.seed_index];
     s1 = s1 ^ (s1 << 31)
     s1 = s1 ^ (s1 >> 11)
     s0 = s0 ^ (s0 >> 30)
-    _seed[_seed_index] = s0 ^ s1
+    state.seed[state.seed_index] = s0 ^ s1
 
-    return _seed[_seed_index] * <unsigned long> (1181783497276652981)
+    return state.seed[state.seed_index] * <unsigned long> (1181783497276652981)
 
-cpdef int randint(int n):
+cdef int randint_state(xorshift_state *state, int n):
     """Return a random integer 0 <= x < n."""
 
     # Reject an apropriate fraction of samples to avoid bias. The loop should
@@ -51,14 +53,25 @@ cpdef int randint(int n):
     cdef int val
 
     while True:
-        r = next_rand()
+        r = next_rand(state)
         val = r % n
         if r - val + n - 1 >= 0:
             return val
 
+cdef double random_state(xorshift_state *state):
+    """Return a random double 0 < x <= 1."""
+    return <double> next_rand(state) / <double> (<unsigned long> - 1)
+
+cdef void cy_seed(unsigned long seed):
+    seed_state(&_state, seed)
+
+cpdef int randint(int n):
+    """Return a random integer 0 <= x < n."""
+    return randint_state(&_state, n)
+
 cpdef double random():
     """Return a random double 0 < x <= 1."""
-    return <double> next_rand() / <double> (<unsigned long> - 1)
+    return random_state(&_state)
 
 MAX_ULONG = 4294967295
 
@@ -35,3 +35,31 @@ class TestEvaluate(unittest.TestCase):
             handtype = eval7.handtype(value)
             self.assertEqual(value, expected_val)
             self.assertEqual(handtype, expected_type)
+
+    def test_range_composition(self):
+        hand_range = eval7.HandRange("AA, QTs, 0.5(KJo), 76s, 8h5c")
+        board = tuple(map(eval7.Card, ("Kh", "Jd", "8h", "5h")))
+        counts, values = eval7.range_composition(hand_range, board)
+        self.assertEqual(counts["High Card"], 6.0)
+        self.assertEqual(counts["Pair"], 6.0)
+        self.assertEqual(counts["Two Pair"], 3.5)
+        self.assertEqual(counts["Flush"], 2.0)
+        self.assertEqual(counts["Straight Flush"], 0.0)
+        self.assertEqual(counts["Flush Draw"], 4.5)
+        self.assertEqual(counts["Straight Draw"], 6.0)
+        # Combos sharing a card with the board are dropped.
+        self.assertEqual(len(values), 21)
+        for hand, value in values.items():
+            self.assertEqual(value, eval7.evaluate(hand + board))
+
+        # Duplicate hands are weighted in counts but merged in values.
+        hand_range = eval7.HandRange("AA, 0.5(AsAh)")
+        counts, values = eval7.range_composition(hand_range, board)
+        self.assertEqual(counts["Pair"], 6.5)
+        self.assertEqual(len(values), 6)
+
+        # A draw to a higher straight than the board makes on its own.
+        hand_range = eval7.HandRange("Tc2d, Kc2d")
+        board = tuple(map(eval7.Card, ("5c", "6d", "8h", "9s")))
+        counts, values = eval7.range_composition(hand_range, board)
+        self.assertEqual(counts["Straight Draw"], 1.0)
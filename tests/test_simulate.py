@@ -0,0 +1,88 @@
+# Copyright 2014 Anonymous7 from Reddit, Julian Andrews
+#
+# This software may be modified and distributed under the terms
+# of the MIT license.  See the LICENSE file for details.
+
+import unittest
+
+import eval7
+from eval7 import xorshift_rand
+
+
+def mask_to_cards(mask):
+    return tuple(card for card in eval7.Deck() if card.mask & mask)
+
+
+class TestSimulate(unittest.TestCase):
+    def test_chunks(self):
+        chunks = list(eval7.simulate(3, 250, chunk_size=100, seed=1))
+        self.assertEqual([len(boards) for _, boards, _, _ in chunks],
+                         [100, 100, 50])
+        for hands, boards, values, winners in chunks:
+            self.assertEqual(len(hands), 3 * len(boards))
+            self.assertEqual(len(values), 3 * len(boards))
+            self.assertEqual(len(winners), len(boards))
+            for i, board_mask in enumerate(boards):
+                board = mask_to_cards(board_mask)
+                self.assertEqual(len(board), 5)
+                dead = board_mask
+                hand_values = []
+                for p in range(3):
+                    hand_mask = hands[3 * i + p]
+                    self.assertEqual(len(mask_to_cards(hand_mask)), 2)
+                    self.assertEqual(dead & hand_mask, 0)
+                    dead |= hand_mask
+                    value = eval7.evaluate(mask_to_cards(hand_mask) + board)
+                    self.assertEqual(values[3 * i + p], value)
+                    hand_values.append(value)
+                best = max(hand_values)
+                expected = sum(1 << p for p, value in enumerate(hand_values)
+                               if value == best)
+                self.assertEqual(winners[i], expected)
+
+    def test_seed(self):
+        first = list(eval7.simulate(4, 1000, seed=42))
+        second = list(eval7.simulate(4, 1000, seed=42))
+        self.assertEqual(first, second)
+
+    def test_seed_is_independent(self):
+        expected = list(eval7.simulate(2, 100, chunk_size=10, seed=42))
+        # Interleave a second generator and shared random calls.
+        first = eval7.simulate(2, 100, chunk_size=10, seed=42)
+        second = eval7.simulate(2, 100, chunk_size=10, seed=42)
+        chunks = []
+        for chunk, _ in zip(first, second):
+            xorshift_rand.randint(52)
+            chunks.append(chunk)
+        self.assertEqual(chunks, expected)
+
+        # A seeded generator doesn't reseed the shared state.
+        xorshift_rand.seed(1)
+        expected = [xorshift_rand.randint(52) for i in range(10)]
+        xorshift_rand.seed(1)
+        list(eval7.simulate(2, 100, seed=42))
+        sample = [xorshift_rand.randint(52) for i in range(10)]
+        self.assertEqual(sample, expected)
+
+    def test_ranges(self):
+        ranges = [eval7.HandRange("AA"), None, eval7.HandRange("0.5(KK), QQ")]
+        hands, _, _, _ = next(eval7.simulate(3, 20000, ranges=ranges, seed=7))
+        kings = 0
+        for hand_mask in hands[0::3]:
+            self.assertEqual({c.rank for c in mask_to_cards(hand_mask)}, {12})
+        for hand_mask in hands[2::3]:
+            ranks = {c.rank for c in mask_to_cards(hand_mask)}
+            self.assertIn(ranks, ({11}, {10}))
+            kings += ranks == {11}
+        self.assertAlmostEqual(kings / 20000, 1 / 3, delta=0.02)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            eval7.simulate(24)
+        with self.assertRaises(ValueError):
+            eval7.simulate(2, num_deals=-5)
+        with self.assertRaises(ValueError):
+            eval7.simulate(2, ranges=[eval7.HandRange("AA")])
+        ranges = [eval7.HandRange("AsAh"), eval7.HandRange("AsAh")]
+        with self.assertRaises(ValueError):
+            next(eval7.simulate(2, ranges=ranges))